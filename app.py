@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import io
 import logging
 from datetime import date
 
@@ -9,10 +10,11 @@ import pandas as pd
 import plotly.express as px
 import streamlit as st
 
-from core.analytics import analyze_transactions
+from core.analytics import analyze_transactions, coerce_dates, format_dates
 from core.auth import authenticate_user
 from core.database import check_database_connection
 from core.transactions import (
+    DateLike,
     TransactionError,
     add_transaction,
     delete_transactions,
@@ -41,16 +43,65 @@ def init_session_state() -> None:
             st.session_state[key] = value
 
 
-def bump_data_version() -> None:
-    st.session_state.data_version += 1
-
-
 @st.cache_data(show_spinner=False, ttl=30)
 def load_transactions(version: int) -> pd.DataFrame:
     del version
     return get_transactions_dataframe()
 
 
+@st.cache_data(show_spinner=False, ttl=30)
+def load_report(start_date: date, end_date: date, version: int) -> pd.DataFrame:
+    del version
+    return generate_report(start_date, end_date)
+
+
+@st.cache_data(show_spinner=False, ttl=30)
+def load_summary(version: int) -> dict[str, float | int]:
+    return analyze_transactions(load_transactions(version))
+
+
+@st.cache_data(show_spinner=False, ttl=30)
+def load_report_summary(
+    start_date: date, end_date: date, version: int
+) -> dict[str, float | int]:
+    return analyze_transactions(load_report(start_date, end_date, version))
+
+
+@st.cache_data(show_spinner=False, ttl=30)
+def load_report_csv(start_date: date, end_date: date, version: int) -> bytes:
+    buffer = io.BytesIO()
+    load_report(start_date, end_date, version).to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, ttl=30)
+def load_delete_labels(version: int) -> dict[str, str]:
+    """Multiselect labels keyed by transaction id, newest first."""
+    display_df = prepare_display_df(load_transactions(version))
+    labels = (
+        format_dates(display_df["date"])
+        + " · "
+        + display_df["remark"].astype(str)
+        + " · "
+        + display_df["amount"].map(format_currency)
+    )
+    return dict(zip(display_df["id"], labels))
+
+
+def invalidate_data() -> None:
+    """Drop cached query results after a write."""
+    st.session_state.data_version += 1
+    for cached in (
+        load_transactions,
+        load_report,
+        load_summary,
+        load_report_summary,
+        load_report_csv,
+        load_delete_labels,
+    ):
+        cached.clear()
+
+
 def format_currency(value: float) -> str:
     return f"₹{value:,.0f}"
 
@@ -73,27 +124,46 @@ def bordered_metric(column, label: str, value: str) -> None:
             st.metric(label, value)
 
 
-def table_column_config(*, editable: bool) -> dict:
+def has_text_dates(df: pd.DataFrame, column: str = "date") -> bool:
+    """True when legacy string dates left the column without a datetime dtype."""
+    return not pd.api.types.is_datetime64_any_dtype(df[column])
+
+
+def table_column_config(*, editable: bool, text_dates: bool = False) -> dict:
     disabled = not editable
+    if text_dates:
+        date_column = st.column_config.TextColumn(
+            TABLE_LABELS["date"], disabled=disabled
+        )
+    else:
+        date_column = st.column_config.DateColumn(
+            TABLE_LABELS["date"], format="YYYY-MM-DD", disabled=disabled
+        )
+    # Keys match the relabelled columns produced by prepare_table_view.
     return {
-        "date": st.column_config.TextColumn(TABLE_LABELS["date"], disabled=disabled),
-        "amount": st.column_config.NumberColumn(
+        TABLE_LABELS["date"]: date_column,
+        TABLE_LABELS["amount"]: st.column_config.NumberColumn(
             TABLE_LABELS["amount"], format="%.0f", disabled=disabled
         ),
-        "remark": st.column_config.TextColumn(TABLE_LABELS["remark"], disabled=disabled),
-        "running_total": st.column_config.NumberColumn(
+        TABLE_LABELS["remark"]: st.column_config.TextColumn(
+            TABLE_LABELS["remark"], disabled=disabled
+        ),
+        TABLE_LABELS["running_total"]: st.column_config.NumberColumn(
             TABLE_LABELS["running_total"], format="%.0f", disabled=True
         ),
     }
 
 
 def prepare_display_df(df: pd.DataFrame) -> pd.DataFrame:
-    view = df.sort_values(["date", "id"], ascending=[False, False]).reset_index(drop=True)
-    return view[["id", *TABLE_COLUMNS]]
+    """Newest first; ``df`` is already chronological (see get_transactions_dataframe)."""
+    return df.iloc[::-1][["id", *TABLE_COLUMNS]].reset_index(drop=True)
 
 
 def prepare_table_view(display_df: pd.DataFrame) -> pd.DataFrame:
-    return display_df[list(TABLE_COLUMNS)].rename(columns=TABLE_LABELS)
+    view = display_df[list(TABLE_COLUMNS)]
+    if has_text_dates(view):
+        view = view.assign(date=format_dates(view["date"]))
+    return view.rename(columns=TABLE_LABELS)
 
 
 def render_sidebar() -> str:
@@ -155,14 +225,11 @@ def render_sidebar_actions() -> None:
             remark = st.text_input("Description", placeholder="Rent, light bill, payment…")
             if st.form_submit_button("Save", width="stretch", type="primary"):
                 ok, message = run_db_operation(
-                    lambda: add_transaction(
-                        txn_date.strftime("%Y-%m-%d"), amount, remark
-                    ),
+                    lambda: add_transaction(txn_date, amount, remark),
                     "Saved.",
                 )
                 if ok:
-                    bump_data_version()
-                    load_transactions.clear()
+                    invalidate_data()
                     st.toast(message, icon="✅")
                     st.rerun()
                 st.error(message)
@@ -179,8 +246,7 @@ def render_sidebar_actions() -> None:
 
             ok, err = run_db_operation(_import, "")
             if ok:
-                bump_data_version()
-                load_transactions.clear()
+                invalidate_data()
                 st.toast(f"Imported {result['count']} rows.", icon="✅")
                 st.rerun()
             st.error(err)
@@ -194,29 +260,21 @@ def render_summary(analysis: dict) -> None:
 
 
 def apply_transaction_edits(
-    display_df: pd.DataFrame, edited_view: pd.DataFrame
+    display_df: pd.DataFrame, edited_rows: dict[int, dict]
 ) -> tuple[bool, str]:
-    edited = edited_view.rename(
-        columns={v: k for k, v in TABLE_LABELS.items()}
-    )
-    edited["id"] = display_df["id"].values
-    original = display_df.set_index("id")
-
-    for _, row in edited.iterrows():
-        row_id = row["id"]
-        prev = original.loc[row_id]
-        if (
-            str(row["date"]) == str(prev["date"])
-            and float(row["amount"]) == float(prev["amount"])
-            and str(row["remark"]) == str(prev["remark"])
-        ):
-            continue
-
+    """Persist only the rows the editor reports as changed."""
+    columns = {v: k for k, v in TABLE_LABELS.items()}
+    for position, changes in edited_rows.items():
+        row = display_df.iloc[int(position)].to_dict()
+        row.update({columns.get(col, col): value for col, value in changes.items()})
+
+        # Raw editor values: a cleared cell is None, which update_transaction
+        # rejects with a TransactionError inside run_db_operation.
         def _save(
-            rid: str = row_id,
-            d: str = str(row["date"]),
-            a: float = float(row["amount"]),
-            r: str = str(row["remark"]),
+            rid: str = row["id"],
+            d: DateLike | None = row["date"],
+            a: float | None = row["amount"],
+            r: str | None = row["remark"],
         ) -> None:
             if not update_transaction(rid, d, a, r):
                 raise TransactionError("Could not save changes.")
@@ -227,6 +285,57 @@ def apply_transaction_edits(
     return True, "Changes saved."
 
 
+@st.fragment
+def render_transaction_editor(
+    display_df: pd.DataFrame, table_view: pd.DataFrame, row_height: int
+) -> None:
+    """Editable table and delete controls; widget changes rerun only this fragment."""
+    st.data_editor(
+        table_view,
+        hide_index=True,
+        width="stretch",
+        num_rows="fixed",
+        column_config=table_column_config(
+            editable=True, text_dates=has_text_dates(display_df)
+        ),
+        key="txn_editor",
+        height=row_height,
+    )
+    action_col, delete_col = st.columns([1, 2])
+    with action_col:
+        if st.button("Save edits", type="primary", width="stretch"):
+            edited_rows = st.session_state.txn_editor.get("edited_rows", {})
+            if not edited_rows:
+                st.info("No changes to save.")
+            else:
+                ok, msg = apply_transaction_edits(display_df, edited_rows)
+                if ok:
+                    invalidate_data()
+                    st.session_state.pop("txn_editor", None)
+                    st.toast(msg, icon="✅")
+                    st.rerun()
+                st.error(msg)
+    with delete_col:
+        labels = load_delete_labels(st.session_state.data_version)
+        ids = st.multiselect(
+            "Remove entries",
+            options=list(labels),
+            format_func=labels.__getitem__,
+            placeholder="Select to delete…",
+            label_visibility="visible",
+        )
+        if st.button("Delete selected", width="stretch") and ids:
+            ok, msg = run_db_operation(
+                lambda: delete_transactions(ids),
+                f"Removed {len(ids)}.",
+            )
+            if ok:
+                invalidate_data()
+                st.toast(msg, icon="✅")
+                st.rerun()
+            st.error(msg)
+
+
 def render_dashboard() -> None:
     try:
         df = load_transactions(st.session_state.data_version)
@@ -240,70 +349,35 @@ def render_dashboard() -> None:
         return
 
     display_df = prepare_display_df(df)
-    analysis = analyze_transactions(df)
-    render_summary(analysis)
+    render_summary(load_summary(st.session_state.data_version))
 
     st.subheader("Recent transactions")
+    text_dates = has_text_dates(df)
+    if text_dates:
+        undated = int(df["date"].map(lambda v: isinstance(v, str)).sum())
+        st.warning(
+            f"{undated} transaction(s) have an unrecognised date. They are left out "
+            "of reports and counted first in the balance; edit the date "
+            "(YYYY-MM-DD) to fix them."
+        )
+
     table_view = prepare_table_view(display_df)
     row_height = min(520, 48 + len(table_view) * 36)
 
     if st.session_state.logged_in:
-        edited_view = st.data_editor(
-            table_view,
-            hide_index=True,
-            width="stretch",
-            num_rows="fixed",
-            column_config=table_column_config(editable=True),
-            key="txn_editor",
-            height=row_height,
-        )
-        action_col, delete_col = st.columns([1, 2])
-        with action_col:
-            if st.button("Save edits", type="primary", width="stretch"):
-                if table_view.equals(edited_view):
-                    st.info("No changes to save.")
-                else:
-                    ok, msg = apply_transaction_edits(display_df, edited_view)
-                    if ok:
-                        bump_data_version()
-                        load_transactions.clear()
-                        st.toast(msg, icon="✅")
-                        st.rerun()
-                    st.error(msg)
-        with delete_col:
-            labels = {
-                f"{r['date']} · {r['remark']} · {format_currency(r['amount'])}": r["id"]
-                for _, r in display_df.iterrows()
-            }
-            to_delete = st.multiselect(
-                "Remove entries",
-                options=list(labels.keys()),
-                placeholder="Select to delete…",
-                label_visibility="visible",
-            )
-            if st.button("Delete selected", width="stretch") and to_delete:
-                ids = [labels[x] for x in to_delete]
-                ok, msg = run_db_operation(
-                    lambda: delete_transactions(ids),
-                    f"Removed {len(ids)}.",
-                )
-                if ok:
-                    bump_data_version()
-                    load_transactions.clear()
-                    st.toast(msg, icon="✅")
-                    st.rerun()
-                st.error(msg)
+        render_transaction_editor(display_df, table_view, row_height)
     else:
         st.dataframe(
             table_view,
             hide_index=True,
             width="stretch",
+            column_config=table_column_config(editable=False, text_dates=text_dates),
             height=row_height,
         )
         st.caption("Sign in to add, edit, or import data.")
 
     with st.expander("Balance over time", expanded=False):
-        chart_df = df.sort_values(["date", "id"])
+        chart_df = df.assign(date=coerce_dates(df["date"])) if text_dates else df
         fig = px.area(
             chart_df,
             x="date",
@@ -335,10 +409,7 @@ def render_report() -> None:
         return
 
     try:
-        report_df = generate_report(
-            start.strftime("%Y-%m-%d"),
-            end.strftime("%Y-%m-%d"),
-        )
+        report_df = load_report(start, end, st.session_state.data_version)
     except TransactionError as exc:
         st.error(str(exc))
         return
@@ -351,18 +422,23 @@ def render_report() -> None:
         st.info("No transactions in this period.")
         return
 
-    stats = analyze_transactions(report_df)
+    stats = load_report_summary(start, end, st.session_state.data_version)
     m1, m2, m3 = st.columns(3)
     bordered_metric(m1, "Rent", format_currency(stats["total_rent"]))
     bordered_metric(m2, "Light bills", format_currency(stats["total_light_bills"]))
     bordered_metric(m3, "Payments", format_currency(stats["total_payments"]))
 
     shown = report_df.rename(columns=TABLE_LABELS)
-    st.dataframe(shown, hide_index=True, width="stretch")
+    st.dataframe(
+        shown,
+        hide_index=True,
+        width="stretch",
+        column_config=table_column_config(editable=False),
+    )
 
     st.download_button(
         "Download CSV",
-        data=report_df.to_csv(index=False),
+        data=load_report_csv(start, end, st.session_state.data_version),
         file_name=f"rent_report_{start}_{end}.csv",
         mime="text/csv",
         width="stretch",
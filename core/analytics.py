@@ -2,19 +2,50 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+# Lowercase substrings, checked in priority order: a remark such as "Paid rent"
+# is a payment, and "Light bill" is never counted as rent.
+CATEGORY_KEYWORDS = (
+    ("payment", ("payment", "paid")),
+    ("light_bill", ("light bill",)),
+    ("rent", ("rent",)),
+)
 
-def _safe_sum(series: pd.Series) -> float:
-    if series.empty:
-        return 0.0
-    return float(series.sum())
+
+def classify_remarks(remarks: pd.Series) -> pd.Series:
+    """Assign each remark exactly one category (payment, light_bill, rent, other)."""
+    lowered = remarks.astype(str).str.lower()
+    masks = [
+        np.logical_or.reduce(
+            [
+                lowered.str.contains(word, na=False, regex=False).to_numpy()
+                for word in words
+            ]
+        )
+        for _, words in CATEGORY_KEYWORDS
+    ]
+    labels = [name for name, _ in CATEGORY_KEYWORDS]
+    return pd.Series(
+        np.select(masks, labels, default="other"), index=lowered.index, name="category"
+    )
+
+
+def coerce_dates(dates: pd.Series) -> pd.Series:
+    """Dates as datetime64; legacy free-text dates that are not ISO become NaT."""
+    return pd.to_datetime(dates, errors="coerce", format="ISO8601")
 
 
-def _safe_mean(series: pd.Series) -> float:
-    if series.empty:
+def format_dates(dates: pd.Series) -> pd.Series:
+    """YYYY-MM-DD labels, falling back to the raw text for unparseable dates."""
+    return coerce_dates(dates).dt.strftime("%Y-%m-%d").fillna(dates.astype(str))
+
+
+def _category_stat(stats: pd.DataFrame, category: str, column: str) -> float:
+    if category not in stats.index:
         return 0.0
-    value = series.mean()
+    value = stats.at[category, column]
     if pd.isna(value):
         return 0.0
     return float(value)
@@ -32,25 +63,26 @@ def analyze_transactions(df: pd.DataFrame) -> dict[str, float | int]:
             "current_balance": 0.0,
         }
 
-    remarks = df["remark"].astype(str)
-    rent_entries = df[remarks.str.contains("Rent", case=False, na=False)]
-    light_bill_entries = df[remarks.str.contains("Light Bill", case=False, na=False)]
-    payments = df[
-        remarks.str.contains(r"Payment|Paid", case=False, na=False, regex=True)
-    ]
-
+    stats = df.groupby(classify_remarks(df["remark"]))["amount"].agg(
+        ["sum", "mean", "size"]
+    )
     # Chronological order must match DB recalc: date, then id (ObjectId insert order).
     # Do not sort by running_total — same-day rows can have lower totals after payments.
+    # Unparseable legacy string dates sort first, as MongoDB orders strings before Dates.
     sort_cols = ["date", "id"] if "id" in df.columns else ["date"]
-    sorted_df = df.sort_values(sort_cols)
+    sorted_df = df.sort_values(
+        sort_cols,
+        key=lambda col: coerce_dates(col) if col.name == "date" else col,
+        na_position="first",
+    )
     current_balance = float(sorted_df["running_total"].iloc[-1])
 
     return {
-        "total_rent": _safe_sum(rent_entries["amount"]),
-        "total_light_bills": _safe_sum(light_bill_entries["amount"]),
-        "total_payments": abs(_safe_sum(payments["amount"])),
-        "avg_monthly_rent": _safe_mean(rent_entries["amount"]),
-        "avg_light_bill": _safe_mean(light_bill_entries["amount"]),
-        "num_payments": int(len(payments)),
+        "total_rent": _category_stat(stats, "rent", "sum"),
+        "total_light_bills": _category_stat(stats, "light_bill", "sum"),
+        "total_payments": abs(_category_stat(stats, "payment", "sum")),
+        "avg_monthly_rent": _category_stat(stats, "rent", "mean"),
+        "avg_light_bill": _category_stat(stats, "light_bill", "mean"),
+        "num_payments": int(_category_stat(stats, "payment", "size")),
         "current_balance": current_balance,
     }
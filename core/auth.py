@@ -4,23 +4,35 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import os
 
 import streamlit as st
 
+PBKDF2_ITERATIONS = 600_000
+
 
 def _admin_credentials() -> tuple[str, str]:
     admin = st.secrets["admin"]
     return str(admin["username"]), str(admin["password"])
 
 
+def _derive(password: str, salt: bytes) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS)
+
+
+@st.cache_resource(show_spinner=False)
+def _password_verifier(expected_password: str) -> tuple[bytes, bytes]:
+    """Salt and derived key for the configured password, computed once per process."""
+    salt = os.urandom(16)
+    return salt, _derive(expected_password, salt)
+
+
 def authenticate_user(username: str, password: str) -> bool:
     """Verify username and password against Streamlit secrets."""
     expected_user, expected_password = _admin_credentials()
     if not username or not password:
         return False
+    salt, expected_key = _password_verifier(expected_password)
     user_ok = hmac.compare_digest(username.strip(), expected_user)
-    password_ok = hmac.compare_digest(
-        hashlib.sha256(password.encode("utf-8")).hexdigest(),
-        hashlib.sha256(expected_password.encode("utf-8")).hexdigest(),
-    )
+    password_ok = hmac.compare_digest(_derive(password, salt), expected_key)
     return user_ok and password_ok
@@ -2,29 +2,125 @@
 
 from __future__ import annotations
 
+import logging
+
 import streamlit as st
-from pymongo import MongoClient
+from pymongo import ASCENDING, MongoClient
 from pymongo.collection import Collection
-from pymongo.errors import PyMongoError
+from pymongo.errors import OperationFailure, PyMongoError
 
 DB_NAME = "rent_tracker"
 COLLECTION_NAME = "transactions"
 
+logger = logging.getLogger(__name__)
+
+# One client per process (cached below); a small pool covers concurrent sessions.
+CLIENT_OPTIONS = {
+    "maxPoolSize": 20,
+    "minPoolSize": 2,
+    "serverSelectionTimeoutMS": 10_000,
+    "connectTimeoutMS": 10_000,
+    "retryWrites": True,
+    "compressors": "zlib",
+}
+
 
 @st.cache_resource(show_spinner=False)
 def get_mongo_client() -> MongoClient:
     """Create a cached MongoDB client and verify connectivity."""
     uri = st.secrets["mongo"]["uri"]
-    client = MongoClient(
-        uri,
-        serverSelectionTimeoutMS=10_000,
-        connectTimeoutMS=10_000,
-        retryWrites=True,
-    )
+    client = MongoClient(uri, **CLIENT_OPTIONS)
     client.admin.command("ping")
+    coll = client[DB_NAME][COLLECTION_NAME]
+    migrate_legacy_documents(coll)
+    ensure_indexes(coll)
     return client
 
 
+def migrate_legacy_documents(coll: Collection) -> None:
+    """Convert documents written by older versions to the current schema.
+
+    The amount migration is not optional: mixing rupee doubles with paise ints
+    would corrupt every running total, so its errors propagate and the client
+    is not cached, retrying on the next rerun. Both steps are idempotent.
+    """
+    try:
+        _migrate_string_dates(coll)
+    except PyMongoError:
+        # Best effort: leftover string dates are surfaced in the dashboard.
+        logger.exception("String date migration failed")
+    _migrate_float_amounts(coll)
+
+
+def _migrate_string_dates(coll: Collection) -> None:
+    # Dates used to be stored as "YYYY-MM-DD" strings; they are now BSON Dates.
+    # Free-text leftovers in other formats are kept as-is rather than aborting.
+    legacy_dates = {"date": {"$type": "string"}}
+    coll.update_many(
+        legacy_dates,
+        [
+            {
+                "$set": {
+                    "date": {
+                        "$dateFromString": {
+                            "dateString": "$date",
+                            "format": "%Y-%m-%d",
+                            # Fall back to the CSV import format before giving up.
+                            "onError": {
+                                "$dateFromString": {
+                                    "dateString": "$date",
+                                    "format": "%d-%m-%Y",
+                                    "onError": "$date",
+                                }
+                            },
+                            "onNull": "$date",
+                        }
+                    }
+                }
+            }
+        ],
+    )
+    skipped = coll.count_documents(legacy_dates)
+    if skipped:
+        logger.warning("%d transaction(s) have unparseable string dates", skipped)
+
+
+def _migrate_float_amounts(coll: Collection) -> None:
+    # Amounts used to be float rupees; they are now integer paise. Values that
+    # cannot be converted (e.g. NaN from a cleared editor cell) are left as-is.
+    legacy_amounts = {"amount": {"$type": "double"}}
+    coll.update_many(
+        legacy_amounts,
+        [
+            {
+                "$set": {
+                    field: {
+                        "$convert": {
+                            "input": {"$round": [{"$multiply": [f"${field}", 100]}, 0]},
+                            "to": "long",
+                            "onError": f"${field}",
+                            "onNull": f"${field}",
+                        }
+                    }
+                    for field in ("amount", "running_total")
+                }
+            }
+        ],
+    )
+    skipped = coll.count_documents(legacy_amounts)
+    if skipped:
+        logger.warning("%d transaction(s) have unconvertible amounts", skipped)
+
+
+def ensure_indexes(coll: Collection) -> None:
+    """Index every chronological query: range filters and (date, _id) sorts."""
+    try:
+        coll.create_index([("date", ASCENDING), ("_id", ASCENDING)])
+    except OperationFailure:
+        # Queries still work without the index, only slower.
+        logger.exception("Could not create transactions index")
+
+
 def get_transactions_collection() -> Collection:
     return get_mongo_client()[DB_NAME][COLLECTION_NAME]
 
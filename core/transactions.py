@@ -4,20 +4,28 @@ from __future__ import annotations
 
 import logging
 import tempfile
+from datetime import date as date_type
+from datetime import datetime
 from pathlib import Path
 from typing import BinaryIO
 
 import pandas as pd
 from bson.objectid import ObjectId
-from pymongo import UpdateOne
 from pymongo.errors import PyMongoError
 
-from core.database import get_transactions_collection
+from core.database import COLLECTION_NAME, get_transactions_collection
 
 logger = logging.getLogger(__name__)
 
+DateLike = str | date_type | datetime
+
 REQUIRED_CSV_COLUMNS = ("Date", "Amount", "Remark")
 DATE_FORMAT = "%d-%m-%Y"
+DOCUMENT_FIELDS = ("date", "amount", "remark", "running_total")
+# Stored as integer paise; DataFrames returned to callers are in rupees.
+MONEY_FIELDS = ["amount", "running_total"]
+# Keeps each insert_many batch well under the 16 MB BSON message limit.
+IMPORT_BATCH_SIZE = 10_000
 
 
 class TransactionError(Exception):
@@ -25,18 +33,37 @@ class TransactionError(Exception):
 
 
 def recalculate_running_totals() -> None:
-    """Recompute running_total for all rows in chronological order."""
+    """Recompute running_total for all rows in chronological order.
+
+    Runs entirely server-side ($setWindowFields, MongoDB 5.0+) and writes back
+    only documents whose total changed.
+    """
     coll = get_transactions_collection()
-    ops: list[UpdateOne] = []
-    running_total = 0.0
-    for doc in coll.find(sort=[("date", 1), ("_id", 1)]):
-        running_total += float(doc["amount"])
-        if doc.get("running_total") != running_total:
-            ops.append(
-                UpdateOne({"_id": doc["_id"]}, {"$set": {"running_total": running_total}})
-            )
-    if ops:
-        coll.bulk_write(ops, ordered=True)
+    coll.aggregate(
+        [
+            {
+                "$setWindowFields": {
+                    "sortBy": {"date": 1, "_id": 1},
+                    "output": {
+                        "new_total": {
+                            "$sum": "$amount",
+                            "window": {"documents": ["unbounded", "current"]},
+                        }
+                    },
+                }
+            },
+            {"$match": {"$expr": {"$ne": ["$running_total", "$new_total"]}}},
+            {"$project": {"_id": 1, "running_total": "$new_total"}},
+            {
+                "$merge": {
+                    "into": COLLECTION_NAME,
+                    "on": "_id",
+                    "whenMatched": "merge",
+                    "whenNotMatched": "discard",
+                }
+            },
+        ]
+    )
 
 
 def parse_csv_data(source: str | Path | BinaryIO) -> pd.DataFrame:
@@ -65,79 +92,107 @@ def parse_csv_data(source: str | Path | BinaryIO) -> pd.DataFrame:
     if (df["Remark"] == "").any():
         raise TransactionError("CSV contains empty remarks.")
 
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
     df = df.rename(columns={"Date": "date", "Amount": "amount", "Remark": "remark"})
     return df.sort_values(["date", "remark"]).reset_index(drop=True)
 
 
+def to_paise(amount: float) -> int:
+    """Rupees to the integer paise stored in MongoDB."""
+    return int(round(float(amount) * 100))
+
+
+def _money_to_rupees(df: pd.DataFrame) -> pd.DataFrame:
+    df[MONEY_FIELDS] = df[MONEY_FIELDS] / 100
+    return df
+
+
+def build_import_documents(df: pd.DataFrame) -> list[dict]:
+    """Turn parsed CSV rows into documents with precomputed running totals."""
+    docs = df[["date", "amount", "remark"]].copy()
+    docs["amount"] = (docs["amount"] * 100).round().astype("int64")
+    docs["running_total"] = docs["amount"].cumsum()
+    return docs.to_dict("records")
+
+
 def import_csv_to_db(source: str | Path | BinaryIO) -> int:
     """Replace all transactions with validated CSV contents. Returns row count."""
     df = parse_csv_data(source)
+    documents = build_import_documents(df)
     coll = get_transactions_collection()
     coll.delete_many({})
-    documents = [
-        {
-            "date": row["date"],
-            "amount": float(row["amount"]),
-            "remark": row["remark"],
-            "running_total": 0.0,
-        }
-        for _, row in df.iterrows()
-    ]
-    if documents:
-        coll.insert_many(documents)
+    for start in range(0, len(documents), IMPORT_BATCH_SIZE):
+        coll.insert_many(documents[start : start + IMPORT_BATCH_SIZE], ordered=False)
+    # Precomputed totals normally match (date, _id) order, making this a
+    # no-op; it still corrects them if ObjectIds are not monotonic (counter
+    # wrap-around or a clock step during the import).
     recalculate_running_totals()
     return len(documents)
 
 
-def validate_transaction_input(date: str, amount: float, remark: str) -> None:
-    if not date:
+def to_bson_date(value: DateLike) -> datetime:
+    """Normalise a date, datetime or ISO string to a midnight datetime (BSON Date)."""
+    try:
+        ts = pd.Timestamp(value)
+    except (ValueError, TypeError) as exc:
+        raise TransactionError(f"Invalid date: {value!r}.") from exc
+    if pd.isna(ts):
+        raise TransactionError("Date is required.")
+    return ts.normalize().to_pydatetime()
+
+
+def validate_transaction_input(date: DateLike, amount: float, remark: str) -> None:
+    if date is None or (isinstance(date, str) and not date.strip()):
         raise TransactionError("Date is required.")
     if remark is None or not str(remark).strip():
         raise TransactionError("Remark is required.")
-    if amount == 0:
+    if amount is None or pd.isna(amount):
+        raise TransactionError("Amount is required.")
+    if to_paise(amount) == 0:
         raise TransactionError("Amount cannot be zero.")
 
 
-def add_transaction(date: str, amount: float, remark: str) -> None:
+def add_transaction(date: DateLike, amount: float, remark: str) -> None:
     validate_transaction_input(date, amount, remark)
     coll = get_transactions_collection()
     coll.insert_one(
         {
-            "date": date,
-            "amount": float(amount),
+            "date": to_bson_date(date),
+            "amount": to_paise(amount),
             "remark": str(remark).strip(),
-            "running_total": 0.0,
+            "running_total": 0,
         }
     )
     recalculate_running_totals()
 
 
 def get_transactions_dataframe() -> pd.DataFrame:
-    transactions = list(get_transactions_collection().find())
-    if not transactions:
-        return pd.DataFrame(columns=["id", "date", "amount", "remark", "running_total"])
-    df = pd.DataFrame(transactions)
-    df["id"] = df["_id"].astype(str)
-    df = df.drop(columns=["_id"])
-    return df[["id", "date", "amount", "remark", "running_total"]]
+    """All transactions in chronological (date, _id) order."""
+    projection = dict.fromkeys(DOCUMENT_FIELDS, 1)
+    cursor = get_transactions_collection().find(
+        {}, projection, sort=[("date", 1), ("_id", 1)]
+    )
+    df = pd.DataFrame.from_records(cursor, columns=["_id", *DOCUMENT_FIELDS])
+    df.insert(0, "id", df.pop("_id").astype(str))
+    return _money_to_rupees(df)
 
 
-def generate_report(start_date: str, end_date: str) -> pd.DataFrame:
+def generate_report(start_date: DateLike, end_date: DateLike) -> pd.DataFrame:
+    start_date, end_date = to_bson_date(start_date), to_bson_date(end_date)
     if start_date > end_date:
         raise TransactionError("Start date must be on or before end date.")
     query = {"date": {"$gte": start_date, "$lte": end_date}}
-    transactions = list(
-        get_transactions_collection().find(query, sort=[("date", 1), ("_id", 1)])
+    projection = {"_id": 0, **dict.fromkeys(DOCUMENT_FIELDS, 1)}
+    cursor = get_transactions_collection().find(
+        query, projection, sort=[("date", 1), ("_id", 1)]
+    )
+    return _money_to_rupees(
+        pd.DataFrame.from_records(cursor, columns=list(DOCUMENT_FIELDS))
     )
-    if not transactions:
-        return pd.DataFrame(columns=["date", "amount", "remark", "running_total"])
-    df = pd.DataFrame(transactions)
-    df = df.drop(columns=["_id"], errors="ignore")
-    return df[["date", "amount", "remark", "running_total"]]
 
 
-def update_transaction(transaction_id: str, new_date: str, new_amount: float, new_remark: str) -> bool:
+def update_transaction(
+    transaction_id: str, new_date: DateLike, new_amount: float, new_remark: str
+) -> bool:
     validate_transaction_input(new_date, new_amount, new_remark)
     try:
         oid = ObjectId(transaction_id)
@@ -149,8 +204,8 @@ def update_transaction(transaction_id: str, new_date: str, new_amount: float, ne
         {"_id": oid},
         {
             "$set": {
-                "date": new_date,
-                "amount": float(new_amount),
+                "date": to_bson_date(new_date),
+                "amount": to_paise(new_amount),
                 "remark": str(new_remark).strip(),
             }
         },
@@ -0,0 +1,36 @@
+"""Unit tests for admin authentication (no Streamlit secrets required)."""
+
+import pytest
+
+from core import auth
+
+
+@pytest.fixture(autouse=True)
+def admin_credentials(monkeypatch):
+    monkeypatch.setattr(auth, "_admin_credentials", lambda: ("admin", "s3cret"))
+    # Keep the KDF cheap in tests; the cached verifier must match the new cost.
+    monkeypatch.setattr(auth, "PBKDF2_ITERATIONS", 1_000)
+    auth._password_verifier.clear()
+    yield
+    auth._password_verifier.clear()
+
+
+def test_authenticate_correct_credentials():
+    assert auth.authenticate_user("admin", "s3cret")
+
+
+def test_authenticate_strips_username_whitespace():
+    assert auth.authenticate_user("  admin ", "s3cret")
+
+
+def test_authenticate_wrong_password():
+    assert not auth.authenticate_user("admin", "wrong")
+
+
+def test_authenticate_wrong_username():
+    assert not auth.authenticate_user("someone", "s3cret")
+
+
+@pytest.mark.parametrize(("username", "password"), [("", "s3cret"), ("admin", ""), ("", "")])
+def test_authenticate_empty_input(username, password):
+    assert not auth.authenticate_user(username, password)
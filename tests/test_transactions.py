@@ -1,12 +1,20 @@
 """Unit tests for CSV parsing and analytics (no database required)."""
 
 import io
+from datetime import date, datetime
 
 import pandas as pd
 import pytest
 
-from core.analytics import analyze_transactions
-from core.transactions import TransactionError, parse_csv_data
+from core.analytics import analyze_transactions, classify_remarks, format_dates
+from core.transactions import (
+    TransactionError,
+    build_import_documents,
+    parse_csv_data,
+    to_bson_date,
+    to_paise,
+    validate_transaction_input,
+)
 
 
 def test_parse_csv_valid():
@@ -14,7 +22,50 @@ def test_parse_csv_valid():
     df = parse_csv_data(io.StringIO(csv))
     assert list(df.columns) == ["date", "amount", "remark"]
     assert len(df) == 2
-    assert df.iloc[0]["date"] == "2024-03-01"
+    assert df.iloc[0]["date"] == pd.Timestamp("2024-03-01")
+
+
+def test_build_import_documents_running_total():
+    csv = (
+        "Date,Amount,Remark\n"
+        "02-03-2024,-2000,Payment\n"
+        "01-03-2024,5000,Rent\n"
+        "03-03-2024,450,Light Bill\n"
+    )
+    docs = build_import_documents(parse_csv_data(io.StringIO(csv)))
+    assert [d["remark"] for d in docs] == ["Rent", "Payment", "Light Bill"]
+    assert [d["amount"] for d in docs] == [500000, -200000, 45000]
+    assert [d["running_total"] for d in docs] == [500000, 300000, 345000]
+    assert all(type(d["amount"]) is int for d in docs)
+
+
+def test_to_paise_rounds_to_integer():
+    assert to_paise(3200) == 320000
+    assert to_paise(0.1 + 0.2) == 30
+    assert to_paise(-15000.5) == -1500050
+
+
+def test_to_bson_date_normalises_inputs():
+    expected = datetime(2024, 3, 1)
+    assert to_bson_date("2024-03-01") == expected
+    assert to_bson_date(date(2024, 3, 1)) == expected
+    assert to_bson_date(pd.Timestamp("2024-03-01 13:45")) == expected
+    with pytest.raises(TransactionError, match="Invalid date"):
+        to_bson_date("not a date")
+
+
+@pytest.mark.parametrize(
+    ("amount", "remark", "message"),
+    [
+        (None, "Rent", "Amount is required"),
+        (float("nan"), "Rent", "Amount is required"),
+        (0.001, "Rent", "Amount cannot be zero"),
+        (100.0, None, "Remark is required"),
+    ],
+)
+def test_validate_rejects_cleared_cells(amount, remark, message):
+    with pytest.raises(TransactionError, match=message):
+        validate_transaction_input("2024-03-01", amount, remark)
 
 
 def test_parse_csv_missing_columns():
@@ -62,3 +113,33 @@ def test_analyze_no_nan_averages():
     result = analyze_transactions(df)
     assert result["avg_monthly_rent"] == 0.0
     assert result["current_balance"] == 100.0
+
+
+def test_classify_remarks_assigns_one_category():
+    remarks = pd.Series(["April Rent", "Light Bill May", "Paid rent", "Payment", "Misc"])
+    assert classify_remarks(remarks).tolist() == [
+        "rent",
+        "light_bill",
+        "payment",
+        "payment",
+        "other",
+    ]
+
+
+def test_format_dates_falls_back_to_legacy_text():
+    dates = pd.Series([datetime(2024, 3, 1), "1st March"], dtype=object)
+    assert format_dates(dates).tolist() == ["2024-03-01", "1st March"]
+
+
+def test_current_balance_with_legacy_string_dates():
+    """Unparseable string dates sort first, matching MongoDB's type ordering."""
+    df = pd.DataFrame(
+        {
+            "id": ["bbb", "aaa"],
+            "date": pd.Series([datetime(2024, 3, 1), "1st March"], dtype=object),
+            "amount": [5000.0, 100.0],
+            "remark": ["Rent", "Misc"],
+            "running_total": [5100.0, 100.0],
+        }
+    )
+    assert analyze_transactions(df)["current_balance"] == 5100.0